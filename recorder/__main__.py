@@ -1,16 +1,16 @@
 from recorder.config import (
     DEFAULT_CONFIG_PATH, DEFAULT_OUTPUT_FOLDER, DEFAULT_TEST_OUTPUT_FOLDER
     )
-from recorder.device import Device, DEVICE_CLASSES
-from recorder.listener import Listener, LISTENER_CLASSES
+from recorder.device import Device, DEVICE_CLASSES, get_device_class
+from recorder.listener import LISTENER_CLASSES, get_listener_class
 from recorder.io import yaml_dump
 from recorder import Recorder, Config
 
 import typer
 
 from pathlib import Path
-from typing import Optional
-from PyInquirer import prompt
+from typing import Dict, Optional, Type
+from importlib.metadata import version, PackageNotFoundError
 
 # Command line application
 app = typer.Typer(
@@ -55,44 +55,53 @@ LISTENER_CLASS_ARGUMENT = typer.Argument(
     metavar='LISTENER_CLASS',
     help=(
         "Case independent name of the listener class to use. Available "
-        f"options: {list(DEVICE_CLASSES.keys())}."
+        f"options: {list(LISTENER_CLASSES.keys())}."
         )
     )
 VERBOSE_OPTION = typer.Option(False, "--verbose", "-v", help="Verbose output.")
 
 
+def version_callback(value: bool):
+    if value:
+        try:
+            typer.echo(version('python-recorder'))
+        except PackageNotFoundError:
+            typer.echo('unknown')
+        raise typer.Exit()
+
+
+@app.callback()
+def callback(
+    _: bool = typer.Option(
+        False,
+        "--version",
+        callback=version_callback,
+        is_eager=True,
+        help="Show the installed version and exit.",
+        ),
+    ):
+    pass
+
+
 def typer_warn(message: str):
     return typer.secho(message, bg='black', fg='yellow')
 
 
 def choose(message: str, choices: list):
     # Utility function that asks the user to configure the devices
-    return prompt({
-        'type': 'list',
-        'name': 'choice',
-        'message': message,
-        'choices': choices,
-        })['choice']
+    from InquirerPy import inquirer
+    return inquirer.select(message=message, choices=choices).execute()
 
 
-def get_device_class(name: str) -> Device:
-    try:
-        return DEVICE_CLASSES[name.lower()]
-    except KeyError:
-        raise RuntimeError(
-            f"Invalid device class `{name}`. Available options: "
-            f"{list(DEVICE_CLASSES.keys())}"
-            )
-
-
-def get_listener_class(name: str) -> Listener:
-    try:
-        return LISTENER_CLASSES[name.lower()]
-    except KeyError:
-        raise RuntimeError(
-            f"Invalid listener class `{name}`. Available options: "
-            f"{list(LISTENER_CLASSES.keys())}"
-            )
+def available_device_classes() -> Dict[str, Type[Device]]:
+    # Device classes whose dependencies can be imported
+    device_classes = {}
+    for name in DEVICE_CLASSES:
+        try:
+            device_classes[name] = DEVICE_CLASSES[name]
+        except ImportError as e:
+            typer_warn(str(e))
+    return device_classes
 
 
 @app.command(help="Display the available devices")
@@ -103,7 +112,7 @@ def show(
     if device_class:
         device_classes = [get_device_class(device_class)]
     else:
-        device_classes = DEVICE_CLASSES.values()
+        device_classes = available_device_classes().values()
     for cls in device_classes:
         devices = cls.find()
         if devices:
@@ -121,15 +130,16 @@ def config_device_class(device: Device) -> dict:
     if not devices:
         typer_warn(f"Could not find {device} devices")
         return choices
+    options = [{
+        'name': f"{_id} {d['name']}",
+        'value': _id
+        } for _id, d in devices.items()]
     while typer.confirm(
         f"Add {'another' if choices else 'a'} {device} device?"
         ):
         _id = choose(
             message=f"Select the {device} to add to the configuration:",
-            choices=[{
-                'name': f"{_id} {d['name']}",
-                'value': _id
-                } for _id, d in devices.items()]
+            choices=options
             )
         choices[index] = devices[_id]
         index += 1
@@ -139,7 +149,7 @@ def config_device_class(device: Device) -> dict:
 @app.command(help="Create a configuration `yaml` file.")
 def config(output: Path = DEFAULT_CONFIG_PATH_OPTION) -> dict:
     _config = {}
-    for name, device_class in DEVICE_CLASSES.items():
+    for name, device_class in available_device_classes().items():
         device_config = config_device_class(device_class)
         if device_config:
             _config[name] = device_config
@@ -212,7 +222,7 @@ def test(
         recorder = Recorder(_config, output_folder)
         output_folder = recorder(seconds=5)
         for _device_class in _config.keys():
-            DEVICE_CLASSES[_device_class].show_results(output_folder)
+            get_device_class(_device_class).show_results(output_folder)
     else:
         # Both device_class and device_id are given
         devices = get_device_class(device_class).find()
@@ -225,7 +235,7 @@ def test(
         _config = Config({device_class: {device_id: device}})
         recorder = Recorder(_config, output_folder)
         output_folder = recorder(seconds=5)
-        DEVICE_CLASSES[device_class].show_results(output_folder)
+        get_device_class(device_class).show_results(output_folder)
 
 
 def main():
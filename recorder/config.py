@@ -1,8 +1,10 @@
 from recorder.io import yaml_dump, yaml_load
-from recorder.device import Device, DEVICE_CLASSES
+from recorder.device import Device, get_device_class
 
 from typing import List
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 DEFAULT_CONFIG_PATH = Path.cwd() / 'python-recorder.yaml'
 
@@ -11,27 +13,46 @@ DEFAULT_OUTPUT_FOLDER = Path.cwd() / 'recordings'
 DEFAULT_TEST_OUTPUT_FOLDER = Path.cwd() / 'test-recordings'
 
 
+def _copy(value):
+    # Copies the dictionaries and lists of a configuration, the rest of the
+    # values loaded from `yaml` are immutable and can be shared
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
 class Config(dict):
 
+    def __deepcopy__(self, memo: dict) -> 'Config':
+        # Faster than the generic `deepcopy`, used on every recording setup
+        return type(self)(_copy(dict(self)))
+
     @classmethod
     def from_yaml(cls, path: Path = DEFAULT_CONFIG_PATH) -> 'Config':
-        if not path.exists():
-            raise AttributeError(f'Configuration file {path} does not exist')
-        return cls(yaml_load(path))
+        try:
+            return cls(yaml_load(path))
+        except FileNotFoundError:
+            raise AttributeError(
+                f'Configuration file {path} does not exist'
+                ) from None
 
     def devices(
         self,
         output_folder: Path = DEFAULT_OUTPUT_FOLDER,
         ) -> List[Device]:
         """Initializes all devices present in the dictionary with the provided
-        output folder.
+        output folder. Devices of classes that are `thread_safe` are
+        initialized concurrently.
 
         Args:
             output_folder (Path, optional): Devices output_folder. Defaults to
             DEFAULT_OUTPUT_FOLDER.
 
         Raises:
-            RuntimeError: _description_
+            RuntimeError: If a device class is not available or a device
+                could not be initialized.
 
         Returns:
             List[Device]: List of initialized devices.
@@ -40,25 +61,31 @@ class Config(dict):
         devices = []
         for _device_class, _devices in self.items():
             try:
-                device_class = DEVICE_CLASSES[_device_class]
-            except KeyError:
+                device_class = get_device_class(_device_class)
+            except RuntimeError as e:
+                raise RuntimeError(f'Invalid configuration file. {e}') from e
+            initializers = [
+                partial(
+                    device_class,
+                    index=index,
+                    output_folder=output_folder,
+                    config=device_config,
+                    ) for index, device_config in _devices.items()
+                ]
+            if device_class.thread_safe and len(initializers) > 1:
+                # Initialize all devices of the class concurrently
+                with ThreadPoolExecutor(len(initializers)) as executor:
+                    initializers = [
+                        executor.submit(init).result for init in initializers
+                        ]
+            try:
+                configs = _devices.items()
+                for (index, device_config), init in zip(configs, initializers):
+                    devices.append(init())
+            except Exception as e:
+                # `index` and `device_config` belong to the failing device
                 raise RuntimeError(
-                    f'Invalid configuration file, {_device_class} is not a '
-                    'valid device class. Available options: '
-                    f'{list(DEVICE_CLASSES.keys())}'
-                    )
-            for index, device_config in _devices.items():
-                try:
-                    devices.append(
-                        device_class(
-                            index=index,
-                            output_folder=output_folder,
-                            config=device_config,
-                            )
-                        )
-                except Exception as e:
-                    raise RuntimeError(
-                        f"Could not initialize {str(device_class)} {index} "
-                        f"with config:\n{yaml_dump(device_config)}\n{str(e)}"
-                        ) from e
+                    f"Could not initialize {str(device_class)} {index} "
+                    f"with config:\n{yaml_dump(device_config)}\n{str(e)}"
+                    ) from e
         return devices
@@ -1,15 +1,30 @@
 from .device import Device
-try:
-    from .microphone import Microphone
-except ImportError as e:
-    class Microphone:
-        def __init__(self, *args, **kwargs) -> None:
-            raise e
-try:
-    from .realsense import RealSense
-except ImportError as e:
-    class RealSense:
-        def __init__(self, *args, **kwargs) -> None:
-            raise e
-
-DEVICE_CLASSES = {repr(cls): cls for cls in Device.__subclasses__()}
+from recorder.registry import LazyRegistry
+
+from typing import Type
+
+# Device backends are imported on first access, as their dependencies are
+# heavy and optional. New devices must be registered here.
+DEVICE_CLASSES = LazyRegistry({
+    'microphone': 'recorder.device.microphone:Microphone',
+    'realsense': 'recorder.device.realsense:RealSense',
+    }, 'device class')
+
+# Allows `from recorder.device import Microphone` without eager imports
+__getattr__ = DEVICE_CLASSES.module_getattr(__name__)
+
+
+def get_device_class(name: str) -> Type[Device]:
+    """Imports the device class registered with the given name.
+
+    Args:
+        name (str): Case independent name of the device class.
+
+    Raises:
+        RuntimeError: If the name is not registered or the dependencies of
+            the device class are not available.
+
+    Returns:
+        Type[Device]: The device class.
+    """
+    return DEVICE_CLASSES.lookup(name)
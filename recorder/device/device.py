@@ -1,8 +1,10 @@
 from recorder.io import yaml_dump
 
-from typing import Dict
+import os
+
+from typing import Dict, List
 from pathlib import Path
-from datetime import datetime
+from time import time
 from abc import ABC, ABCMeta, abstractmethod
 
 
@@ -16,8 +18,13 @@ class MetaDevice(ABCMeta):
 
 
 class Device(ABC, metaclass=MetaDevice):
+    # Whether devices of this class can be initialized, started and stopped
+    # concurrently from different threads
+    thread_safe = False
 
     def __init__(self, index: int, output_folder: Path, config: dict):
+        # Whether the configuration has recording data that must be saved
+        self._dirty = False
         self.config = config
         if 'start_timestamp' in self.config:
             raise AssertionError
@@ -34,13 +41,24 @@ class Device(ABC, metaclass=MetaDevice):
         return f'{repr(type(self))}{self.index}'
 
     def __del__(self):
+        # Save recordings that were started but never stopped. Attributes
+        # might be missing if initialization failed
+        if getattr(self, '_dirty', False):
+            self.save_config()
+
+    def save_config(self) -> None:
+        # Stores the configuration along with the recorded output
         yaml_dump(self.config, to_file=self.output_file.with_suffix('.yaml'))
+        self._dirty = False
 
     @classmethod
     @abstractmethod
     def find(cls) -> Dict[int, dict]:
         """Finds devices connected to the current system.
 
+        Device discovery can be slow, so implementations may cache the result
+        for the lifetime of the process. Callers must not modify it.
+
         Returns:
             dict: A dictionary of devices with a numeric `id` as key and a
             the device properties as value.
@@ -48,9 +66,10 @@ class Device(ABC, metaclass=MetaDevice):
 
     def start(self) -> None:
         # Starts recording storing the start timestamp in configuration
-        self.config['start_timestamp'] = datetime.now().timestamp()
+        self.config['start_timestamp'] = time()
+        self._dirty = True
         self._start()
-        self.config['started_timestamp'] = datetime.now().timestamp()
+        self.config['started_timestamp'] = time()
 
     @abstractmethod
     def _start(self) -> None:
@@ -59,9 +78,10 @@ class Device(ABC, metaclass=MetaDevice):
 
     def stop(self):
         # Stops recording storing the end timestamp in configuration
-        self.config['stop_timestamp'] = datetime.now().timestamp()
+        self.config['stop_timestamp'] = time()
         self._stop()
-        self.config['stopped_timestamp'] = datetime.now().timestamp()
+        self.config['stopped_timestamp'] = time()
+        self.save_config()
 
     @abstractmethod
     def _stop(self):
@@ -72,3 +92,16 @@ class Device(ABC, metaclass=MetaDevice):
     @abstractmethod
     def show_results(cls, from_folder):
         pass
+
+    @classmethod
+    def recorded_files(cls, from_folder: Path, suffix: str) -> List[Path]:
+        # Files with the given suffix recorded by devices of this class, found
+        # in a single pass over the folder and ordered by device index
+        prefix = repr(cls)
+        with os.scandir(from_folder) as entries:
+            files = [
+                Path(e.path) for e in entries if e.name.startswith(prefix)
+                and e.name.endswith(suffix) and e.is_file()
+                ]
+        # Shorter indexes first, so that `microphone2` precedes `microphone10`
+        return sorted(files, key=lambda f: (len(f.stem), f.stem))
@@ -1,17 +1,43 @@
 from recorder.device import Device
-from recorder.io import wave_read
+from recorder.io import FrameWriter, wave_read
 
-import wave
+import os
+import sys
+import warnings
 import sounddevice as sd
 
 from pathlib import Path
+from typing import Tuple
 from inspect import signature
+from functools import lru_cache
+
+
+def set_realtime_priority() -> bool:
+    # Best effort attempt to give the calling thread realtime priority. On
+    # Linux it requires the CAP_SYS_NICE capability or an RLIMIT_RTPRIO limit.
+    try:
+        if hasattr(os, 'sched_setscheduler'):
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+            return True
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            # THREAD_PRIORITY_TIME_CRITICAL
+            return bool(
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 15)
+                )
+    except OSError:
+        pass
+    return False
 
 
 class Microphone(Device):
-    stream_keyword_arguments = [
-        str(s) for s in signature(sd.RawInputStream).parameters
-        ]
+    # PortAudio functions must not be called concurrently
+    thread_safe = False
+    stream_keyword_arguments = frozenset(
+        signature(sd.RawInputStream).parameters
+        )
+    playback_blocksize = 4096  # Frames written at once by `show_results`
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -21,17 +47,33 @@ class Microphone(Device):
             raise AssertionError
         if 'channels' not in self.config:
             raise AssertionError
+        # Samples are stored as signed integers that `wave_read` can map
+        if (samplewidth := self.config.get('samplewidth', 2)) not in (2, 4):
+            raise AttributeError(
+                f'Unsupported `samplewidth` {samplewidth}, must be 2 or 4'
+                )
         # Signature from sounddevice.RawInputStream
         stream_kwargs = {
-            k: self.config[k]
-            for k in self.config.keys() if k in self.stream_keyword_arguments
+            k: v
+            for k, v in self.config.items()
+            if k in self.stream_keyword_arguments
             }
-        self.stream = self._get_stream(
+        self.stream, self.writer = self._get_stream(
             device=self.config['index'],
             output_path=self.output_file.with_suffix('.wav'),
+            samplewidth=samplewidth,
             **stream_kwargs
             )
 
+    def __del__(self):
+        # Release the stream and complete the `wav` file of recordings that
+        # were never stopped. The writer thread can not be waited for while
+        # the interpreter exits, but the header is kept up to date anyway.
+        # Attributes might be missing if initialization failed.
+        if hasattr(self, 'writer') and not sys.is_finalizing():
+            self._stop()
+        super().__del__()
+
     @staticmethod
     def _get_stream(
         device: int,  # Device identifier
@@ -41,22 +83,26 @@ class Microphone(Device):
         channels: int = None,  # Number of channels
         **stream_kwargs,  # Additional keyword arguments for sd.RawInputStream
         # https://python-sounddevice.readthedocs.io/en/0.4.4/api/streams.html#sounddevice.InputStream
-        ) -> sd.InputStream:
-        f = wave.open(str(output_path), 'wb')
-        f.setnchannels(int(channels))
-        f.setframerate(int(samplerate))
-        f.setsampwidth(samplewidth)
-        return sd.RawInputStream(
+        ) -> Tuple[sd.RawInputStream, FrameWriter]:
+        writer = FrameWriter(
+            output_path,
+            int(channels),
+            int(samplerate),
+            samplewidth,
+            on_audio_thread=set_realtime_priority,
+            )
+        stream = sd.RawInputStream(
             device=device,
             dtype=f'int{samplewidth*8}',
             samplerate=samplerate,
             channels=channels,
-            callback=lambda data, N, t, status: f.writeframesraw(data),
-            finished_callback=f.close,
+            callback=writer.callback,
             **stream_kwargs
             )
+        return stream, writer
 
     @classmethod
+    @lru_cache(maxsize=1)
     def find(cls) -> dict:
         devices = {}
         for idx, d in enumerate(sd.query_devices()):
@@ -70,17 +116,39 @@ class Microphone(Device):
         return devices
 
     def _start(self):
+        self.writer.start()
         self.stream.start()
+        # Relates the stream clock to the `started_timestamp`
+        self.config['started_stream_time'] = self.stream.time
 
     def _stop(self):
-        self.stream.stop()
-        self.stream.close()
+        if not self.stream.closed:
+            self.stream.stop()
+            self.stream.close()
+        self.writer.close()
+        if self.writer.first_adc_time is not None:
+            self.config['first_adc_time'] = self.writer.first_adc_time
+        if self.writer.dropped:
+            self.config['dropped_bytes'] = self.writer.dropped
+        if self.writer.error is not None:
+            # The `wav` file only holds the frames written before the error
+            self.config['write_error'] = str(self.writer.error)
+            warnings.warn(
+                f'Recording of {self} is incomplete, writing '
+                f'{self.writer.path} failed: {self.writer.error}'
+                )
 
     @classmethod
     def show_results(cls, from_folder):
-        for _file in from_folder.glob(f'{repr(cls)}*.wav'):
+        for _file in cls.recorded_files(from_folder, '.wav'):
             print(f'Playing {_file}')
             with open(_file.with_suffix('.yaml'), encoding='utf-8') as f:
                 print(f.read())
             data, fs = wave_read(_file)
-            sd.play(data, samplerate=fs, blocking=True)
+            # Frames are streamed from the mapped file in blocks, so that
+            # playback starts right away and uses constant memory
+            with sd.OutputStream(
+                samplerate=fs, channels=data.shape[1], dtype=data.dtype.name
+                ) as stream:
+                for i in range(0, len(data), cls.playback_blocksize):
+                    stream.write(data[i:i + cls.playback_blocksize])
@@ -1,9 +1,33 @@
 from recorder.device import Device
 
+import sys
 import pyrealsense2 as rs
 
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Enumeration values indexed by the names used in the configuration
+STREAM_TYPES = dict(rs.stream.__members__)
+FORMATS = dict(rs.format.__members__)
+
+# Configuration names indexed by enumeration values, used instead of slicing
+# the string representation of each value
+STREAM_TYPE_NAMES = {v: k for k, v in STREAM_TYPES.items()}
+FORMAT_NAMES = {v: k for k, v in FORMATS.items()}
+DISTORTION_NAMES = {v: k for k, v in rs.distortion.__members__.items()}
+
+
+@lru_cache(maxsize=1)
+def context() -> rs.context:
+    # Creating a librealsense context is expensive, a single one is shared
+    return rs.context()
+
 
 class RealSense(Device):
+    # librealsense releases the GIL while negotiating with the device
+    thread_safe = True
+    # Last `find` result, along with the serial numbers it was found for
+    _found = ((), {})
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -16,8 +40,8 @@ class RealSense(Device):
         self.rsconfig.enable_device(sn)
         for stream in streams.values():
             parameters = {
-                'stream_type': getattr(rs.stream, stream['type']),
-                'format': getattr(rs.format, stream['format']),
+                'stream_type': STREAM_TYPES[stream['type']],
+                'format': FORMATS[stream['format']],
                 'framerate': stream['framerate'],
                 }
             if 'width' in stream:
@@ -28,59 +52,113 @@ class RealSense(Device):
             str(self.output_file.with_suffix('.bag'))
             )
         self.pipeline = rs.pipeline()
+        self.streaming = False
+        self.recorder = None
+        if self.config.get('warm_start', False):
+            # Start streaming during setup with the recording paused, so that
+            # `start` only needs to resume it
+            profile = self._start_pipeline()
+            self.recorder = profile.get_device().as_recorder()
+            self.recorder.pause()
+
+    def __del__(self):
+        # Release the camera when the device is discarded while streaming,
+        # such as a warm started device that is set up again. Attributes
+        # might be missing if initialization failed.
+        if getattr(self, 'streaming', False) and not sys.is_finalizing():
+            self._stop()
+        super().__del__()
+
+    def _start_pipeline(self) -> 'rs.pipeline_profile':
+        profile = self.pipeline.start(self.rsconfig)
+        self.streaming = True
+        if 'frames_queue_size' in self.config:
+            # Bound the frames each sensor can hold queued, so that frames are
+            # dropped instead of accumulating in memory if recording lags
+            for sensor in profile.get_device().query_sensors():
+                if sensor.supports(rs.option.frames_queue_size):
+                    sensor.set_option(
+                        rs.option.frames_queue_size,
+                        self.config['frames_queue_size'],
+                        )
+        return profile
+
+    @staticmethod
+    def _stream_properties(s: 'rs.stream_profile') -> dict:
+        # Configuration parameters of a stream profile
+        properties = {
+            'format': FORMAT_NAMES[s.format()],
+            'framerate': s.fps(),
+            'type': STREAM_TYPE_NAMES[s.stream_type()],
+            }
+        if s.is_motion_stream_profile():
+            properties['intrinsics'] = \
+                s.as_motion_stream_profile().get_motion_intrinsics().data
+        elif s.is_video_stream_profile():
+            intrinsics = s.as_video_stream_profile().get_intrinsics()
+            properties.update({
+                'coeffs': intrinsics.coeffs,
+                'model': DISTORTION_NAMES[intrinsics.model],
+                'fx': intrinsics.fx,
+                'fy': intrinsics.fy,
+                'width': intrinsics.width,
+                'height': intrinsics.height,
+                'ppx': intrinsics.ppx,
+                'ppy': intrinsics.ppy,
+                })
+        return properties
+
+    @classmethod
+    def _probe(cls, d: 'rs.device') -> dict:
+        # Configuration parameters of a connected device
+        streams = {}
+        # Query the sensors directly instead of resolving a pipeline, which
+        # would negotiate the streams with the device
+        for sensor in d.query_sensors():
+            for s in sensor.get_stream_profiles():
+                name = s.stream_name()
+                # Keep the default profile of each stream, which is the one a
+                # pipeline resolves when enabling all streams
+                if s.is_default() and name not in streams:
+                    streams[name] = cls._stream_properties(s)
+        return {
+            'name': d.get_info(rs.camera_info.name),
+            'streams': streams,
+            'serial_number': d.get_info(rs.camera_info.serial_number),
+            }
 
     @classmethod
     def find(cls) -> dict:
-        devices = {}
-        for d in rs.context().query_devices():
-            sn = d.get_info(rs.camera_info.serial_number)
-            device_name = d.get_info(rs.camera_info.name)
-            del d
-            config = rs.config()
-            config.enable_device(sn)
-            config.enable_all_streams()
-            pipeline_profile = config.resolve(
-                rs.pipeline_wrapper(rs.pipeline())
+        connected = {
+            d.get_info(rs.camera_info.serial_number): d
+            for d in context().query_devices()
+            }
+        # Reuse the last result unless devices were connected or removed
+        serial_numbers, devices = cls._found
+        if serial_numbers == tuple(sorted(connected)):
+            return devices
+        # Probing waits on USB transfers, so devices are probed concurrently
+        with ThreadPoolExecutor(max(1, min(8, len(connected)))) as executor:
+            devices = dict(
+                zip(connected, executor.map(cls._probe, connected.values()))
                 )
-            streams = {}
-            for s in pipeline_profile.get_streams():
-                name = s.stream_name()
-                streams[name] = {
-                    'format': str(s.format())[7:],  # remove 'format.'
-                    'framerate': s.fps(),
-                    'type': str(s.stream_type())[7:],  # remove 'stream.'
-                    }
-                if s.is_motion_stream_profile():
-                    streams[name]['intrinsics'] = \
-                        s.as_motion_stream_profile().get_motion_intrinsics().data
-                elif s.is_video_stream_profile():
-                    intrinsics = s.as_video_stream_profile().get_intrinsics()
-                    streams[name].update({
-                        'coeffs': intrinsics.coeffs,
-                        'model': str(intrinsics.model)[11:],  # - 'distortion.'
-                        'fx': intrinsics.fx,
-                        'fy': intrinsics.fy,
-                        'width': intrinsics.width,
-                        'height': intrinsics.height,
-                        'ppx': intrinsics.ppx,
-                        'ppy': intrinsics.ppy,
-                        })
-            devices[sn] = {
-                'name': device_name,
-                'streams': streams,
-                'serial_number': sn,
-                }
+        cls._found = (tuple(sorted(connected)), devices)
         return devices
 
     def _start(self):
-        self.pipeline.start(self.rsconfig)
+        if self.recorder:
+            self.recorder.resume()
+        else:
+            self._start_pipeline()
 
     def _stop(self):
-        self.pipeline.stop()
+        if self.streaming:
+            self.pipeline.stop()
+            self.streaming = False
 
     @classmethod
     def show_results(cls, from_folder):
-        for _file in from_folder.glob(f'{repr(cls)}*.bag'):
+        for _file in cls.recorded_files(from_folder, '.bag'):
             print(f'{_file}: {_file.stat().st_size} bytes')
             with open(_file.with_suffix('.yaml'), encoding='utf-8') as f:
                 print(f.read())
@@ -1,30 +1,283 @@
-import wave
+import os
 import yaml
-import numpy as np
+import struct
+import warnings
 
 from pathlib import Path
-from typing import Tuple
-
-
-def wave_read(filename: Path) -> Tuple[np.ndarray, int]:
-    # Utility function that reads the whole `wav` file content into a numpy
-    with wave.open(str(filename), 'rb') as f:
-        return (
-            np.reshape(
-                np.frombuffer(
-                    f.readframes(f.getnframes()),
-                    dtype=f'int{f.getsampwidth()*8}'
-                    ), (-1, f.getnchannels())
-                ),
-            f.getframerate(),
+from typing import BinaryIO, Callable, Optional, Tuple, TYPE_CHECKING
+from threading import Event, Thread
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    # PyYAML built without LibYAML bindings
+    from yaml import SafeLoader, SafeDumper
+    warnings.warn(
+        'PyYAML was built without LibYAML, configuration files are parsed '
+        'with the slower pure Python loader'
+        )
+
+# Canonical PCM `wav` header, frames are stored right after it
+WAVE_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+
+def wave_header(
+    channels: int,
+    samplerate: int,
+    samplewidth: int,
+    data_size: int = 0,
+    ) -> bytes:
+    # Utility function that packs the header of a PCM `wav` file whose frames
+    # take `data_size` bytes
+    return WAVE_HEADER.pack(
+        b'RIFF',
+        WAVE_HEADER.size - 8 + data_size,
+        b'WAVE',
+        b'fmt ',
+        16,  # Size of the format chunk
+        1,  # PCM
+        channels,
+        samplerate,
+        samplerate * channels * samplewidth,  # Bytes per second
+        channels * samplewidth,  # Bytes per frame
+        samplewidth * 8,  # Bits per sample
+        b'data',
+        data_size,
+        )
+
+
+def _read_wave_header(f: BinaryIO) -> Tuple[int, int, int, int]:
+    # Parses the chunks of a PCM `wav` file up to the start of its frames.
+    # Returns the number of channels, sample rate, sample width and data size.
+    riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+    if riff != b'RIFF' or wave_id != b'WAVE':
+        raise ValueError(f'{f.name} is not a `wav` file')
+    channels = None
+    while True:
+        try:
+            chunk_id, size = struct.unpack('<4sI', f.read(8))
+        except struct.error:
+            raise ValueError(f'No data found in {f.name}') from None
+        if chunk_id == b'data':
+            break
+        if chunk_id == b'fmt ':
+            tag, channels, samplerate, _, _, bits = struct.unpack(
+                '<HHIIHH', f.read(16)
+                )
+            size -= 16
+            if tag == 0xFFFE and size >= 10:
+                # WAVE_FORMAT_EXTENSIBLE, the actual format is at the start
+                # of the subformat GUID
+                tag, = struct.unpack('<8xH', f.read(10))
+                size -= 10
+            if tag != 1 or bits not in (16, 32):
+                raise ValueError(
+                    f'Unsupported format in {f.name}, only 16 and 32 bit PCM '
+                    '`wav` files can be read'
+                    )
+        f.seek(size + size % 2, os.SEEK_CUR)  # Chunks are word aligned
+    if channels is None:
+        raise ValueError(f'No format found in {f.name}')
+    # Files that were not properly closed have an incomplete data size
+    remaining = os.fstat(f.fileno()).st_size - f.tell()
+    if not size or size > remaining:
+        size = remaining
+    return channels, samplerate, bits // 8, size
+
+
+def wave_read(filename: Path) -> Tuple['np.ndarray', int]:
+    # Utility function that maps the whole `wav` file content into a read-only
+    # numpy array, frames are only read from disk when accessed
+    import numpy as np
+    with open(filename, 'rb') as f:
+        channels, samplerate, samplewidth, size = _read_wave_header(f)
+        offset = f.tell()
+    shape = (size // (channels * samplewidth), channels)
+    dtype = f'int{samplewidth*8}'
+    if not shape[0]:
+        return np.empty(shape, dtype=dtype), samplerate
+    return np.memmap(
+        filename, dtype=dtype, mode='r', offset=offset, shape=shape
+        ), samplerate
+
+
+def wave_write(filename: Path, samples: 'np.ndarray', samplerate: int):
+    # Utility function that writes a numpy array of integer samples with shape
+    # (frames, channels) into a `wav` file. Samples are stored little endian,
+    # converting the byte order in a single vectorized pass if needed.
+    import numpy as np
+    if (
+        samples.ndim != 2 or samples.dtype.kind != 'i'
+        or samples.itemsize not in (2, 4)
+        ):
+        raise ValueError(
+            'Samples must be 16 or 32 bit signed integers with shape '
+            f'(frames, channels), not {samples.dtype} with shape '
+            f'{samples.shape}'
+            )
+    data = np.ascontiguousarray(samples, dtype=samples.dtype.newbyteorder('<'))
+    with open(filename, 'wb') as f:
+        f.write(
+            wave_header(
+                data.shape[1],
+                samplerate,
+                data.itemsize,
+                data_size=data.nbytes
+                )
             )
+        f.write(data)
+
+
+class FrameWriter(Thread):
+    """Writes audio frames to a `wav` file from a background thread.
+
+    The audio callback only copies each buffer into a preallocated ring
+    buffer, so that neither file IO nor allocations happen in the realtime
+    audio thread. The ring buffer is checked every `interval` seconds and
+    drained to the file in writes of at least `chunk_size` bytes, updating
+    the header after each one. The file is created when the writer is started.
+    Frames that do not fit in the ring buffer are dropped and counted in
+    `dropped`. The optional `on_audio_thread` hook is called from the audio
+    thread with its first buffer, e.g. to raise the priority of the thread.
+    Errors while writing stop the writer, closing the file, and are kept in
+    `error` for the owner of the writer to report.
+    """
+    interval = 0.1  # Seconds between checks of the ring buffer
+    chunk_size = 32 * 1024  # Minimum bytes per write while recording
+    buffer_duration = 2  # Seconds of audio held by the ring buffer
+
+    def __init__(
+        self,
+        path: Path,
+        channels: int,
+        samplerate: int,
+        samplewidth: int,
+        on_audio_thread: Optional[Callable[[], object]] = None,
+        ):
+        super().__init__(daemon=True)
+        self.path = path
+        self.on_audio_thread = on_audio_thread
+        self.format = (channels, samplerate, samplewidth)
+        # The file is only created when the writer is started
+        self.fd = None
+        self.data_size = 0
+        frame_size = channels * samplewidth
+        self.buffer = memoryview(
+            bytearray(self.buffer_duration * samplerate * frame_size)
+            )
+        # Total bytes copied into and out of the ring buffer. Each one is
+        # only updated by a single thread, the audio and the writer one.
+        self.written = 0
+        self.read = 0
+        self.dropped = 0
+        self.closed = Event()
+        self.error = None
+        # Stream time at which the first buffer was captured, in seconds
+        self.first_adc_time = None
+
+    def callback(self, data, frames: int, time, status) -> None:
+        # Stream callback, called from the audio thread with each buffer
+        if self.first_adc_time is None:
+            # First buffer of the stream
+            self.first_adc_time = time.inputBufferAdcTime
+            if self.on_audio_thread is not None:
+                self.on_audio_thread()
+        # The buffer is reused by PortAudio, so it must be copied
+        data = memoryview(data)
+        size, n = len(self.buffer), len(data)
+        if n > size - (self.written - self.read):
+            self.dropped += n
+            return
+        start = self.written % size
+        if start + n <= size:
+            self.buffer[start:start + n] = data
+        else:
+            # Wrap around the end of the ring buffer
+            split = size - start
+            self.buffer[start:] = data[:split]
+            self.buffer[:n - split] = data[split:]
+        self.written += n
+
+    def start(self) -> None:
+        # Frames are written with unbuffered system calls, the ring buffer
+        # already batches them
+        self.fd = os.open(
+            self.path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+            0o666,
+            )
+        self._write(wave_header(*self.format))
+        super().start()
+
+    def close(self) -> None:
+        # Writes the pending frames and closes the file, waiting until done.
+        # Writers that were never started have no file to close.
+        self.closed.set()
+        if self.ident is not None:
+            self.join()
+
+    def _write(self, *buffers) -> None:
+        # Writes all buffers in order, with a single system call per attempt
+        # where `os.writev` is available
+        buffers = [b for b in buffers if len(b)]
+        while buffers:
+            if hasattr(os, 'writev'):
+                n = os.writev(self.fd, buffers)
+            else:
+                n = os.write(self.fd, buffers[0])
+            while buffers and n >= len(buffers[0]):
+                n -= len(buffers.pop(0))
+            if buffers:
+                buffers[0] = buffers[0][n:]
+
+    def _drain(self, force: bool = False) -> None:
+        # Writes the frames copied into the ring buffer since the last drain,
+        # unless they are too few to be worth a write
+        size, written = len(self.buffer), self.written
+        if not force and written - self.read < min(self.chunk_size, size // 2):
+            return
+        start, end = self.read % size, written % size
+        if written - self.read == size or end < start:
+            # Both segments around the end of the ring buffer
+            self._write(self.buffer[start:], self.buffer[:end])
+        else:
+            self._write(self.buffer[start:end])
+        self.data_size += written - self.read
+        self.read = written
+        if hasattr(os, 'posix_fadvise'):
+            # Recorded frames are not read back, so they are dropped from the
+            # page cache as soon as the kernel has flushed them to disk
+            os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        # Keep the header up to date, so that the file is valid even if the
+        # writer is never closed
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        self._write(wave_header(*self.format, data_size=self.data_size))
+        os.lseek(self.fd, 0, os.SEEK_END)
+
+    def run(self) -> None:
+        try:
+            while not self.closed.wait(self.interval):
+                self._drain()
+            self._drain(force=True)
+        except Exception as e:
+            # e.g. a full disk, or a data size the header can not hold.
+            # Frames copied afterwards are lost, the owner reports it.
+            self.error = e
+        finally:
+            os.close(self.fd)
+            self.fd = None
 
 
 def yaml_dump(data, to_file: Path = None) -> str:
     if to_file:
         with open(to_file, 'w', encoding="utf-8") as f:
-            return yaml.dump(data, stream=f, allow_unicode=True)
-    return yaml.dump(data, allow_unicode=True)
+            return yaml.dump(
+                data, stream=f, Dumper=SafeDumper, allow_unicode=True
+                )
+    return yaml.dump(data, Dumper=SafeDumper, allow_unicode=True)
 
 
 def yaml_load(from_file: Path) -> dict:
@@ -33,4 +286,4 @@ def yaml_load(from_file: Path) -> dict:
             f'`from_file` must be a Path object, not {type(from_file)}'
             )
     with open(from_file, 'r', encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
@@ -1,10 +1,29 @@
 from .listener import Listener
+from recorder.registry import LazyRegistry
 
-try:
-    from .localhost import Localhost
-except ImportError as e:
-    class Localhost:
-        def __init__(self, *args, **kwargs) -> None:
-            raise e
+from typing import Type
 
-LISTENER_CLASSES = {repr(cls): cls for cls in Listener.__subclasses__()}
+# Listener backends are imported on first access, as their dependencies are
+# heavy and optional. New listeners must be registered here.
+LISTENER_CLASSES = LazyRegistry({
+    'localhost': 'recorder.listener.localhost:Localhost',
+    }, 'listener class')
+
+# Allows `from recorder.listener import Localhost` without eager imports
+__getattr__ = LISTENER_CLASSES.module_getattr(__name__)
+
+
+def get_listener_class(name: str) -> Type[Listener]:
+    """Imports the listener class registered with the given name.
+
+    Args:
+        name (str): Case independent name of the listener class.
+
+    Raises:
+        RuntimeError: If the name is not registered or the dependencies of
+            the listener class are not available.
+
+    Returns:
+        Type[Listener]: The listener class.
+    """
+    return LISTENER_CLASSES.lookup(name)
@@ -2,12 +2,29 @@ from recorder.listener import Listener
 
 import socket
 
-from flask import Flask, request, Response
+from threading import Lock
+from functools import lru_cache
+
+from flask import Flask, Response, abort, request
 
 # Troubleshooting:
 # https://stackoverflow.com/questions/62705271/connect-to-flask-server-from-other-devices-on-same-network
 
 
+@lru_cache(maxsize=1)
+def local_host() -> str:
+    # Address of this machine in the local network. Connecting a UDP socket
+    # sends nothing, it only selects the network interface.
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.2)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        # No route to the outside, listen on all interfaces
+        return '0.0.0.0'
+
+
 class EndpointAction:
     response = None
 
@@ -25,8 +42,13 @@ class EndpointAction:
 
 class Localhost(Listener):
 
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(self, *args, debug: bool = False, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        # Flask debug mode reloads the module, initializing everything twice
+        self.debug = debug
+        self.recording = False
+        # Requests are served concurrently, but they change the recorder
+        self.lock = Lock()
         self.app = Flask('python-recorder')
         self.app.add_url_rule(
             '/setup', '/setup', EndpointAction(self.setup), methods=['GET']
@@ -40,18 +62,33 @@ class Localhost(Listener):
 
     def setup(self):
         name = request.args.get('name', None)
-        self.recorder.setup(name=name)
-        return str(self.recorder.next_output.name)
+        with self.lock:
+            if self.recording:
+                # Setting up would replace the devices that are recording
+                abort(409, 'Recording in progress, stop it before setup')
+            pending = self.recorder.next_output
+            # Reuse a setup that has not been started, its devices are ready
+            if pending and name in (None, pending.name):
+                return str(pending.name)
+            self.recorder.setup(name=name)
+            return str(self.recorder.next_output.name)
 
     def start(self):
-        self.recorder.start()
+        with self.lock:
+            if self.recording:
+                abort(409, 'Recording already in progress')
+            if self.recorder.next_output is None:
+                # Recorder.start would silently do nothing without devices
+                abort(409, 'Recording not setup, call /setup first')
+            self.recorder.start()
+            self.recording = True
         return 'Recording started'
 
     def stop(self):
-        return str(self.recorder.stop().name)
+        with self.lock:
+            output = self.recorder.stop()
+            self.recording = False
+            return str(output.name)
 
     def listen(self):
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        host = s.getsockname()[0]
-        self.app.run(debug=True, host=host)
+        self.app.run(debug=self.debug, host=local_host(), threaded=True)
@@ -1,16 +1,16 @@
 from recorder.config import Config, DEFAULT_OUTPUT_FOLDER
 
-from time import sleep
+from time import monotonic
 from pathlib import Path
 from copy import deepcopy
 from typing import Optional
 from typer import progressbar
 from datetime import datetime
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor
 
 
 class Recorder:
-    next_output = None
-    devices = []
 
     def __init__(
         self,
@@ -35,6 +35,10 @@ class Recorder:
                 required.
         """
         self.input_config = config
+        # Set when the recording is stopped, interrupting `wait`
+        self._wait_event = Event()
+        self.next_output = None
+        self.devices = []
         self.config = deepcopy(self.input_config)
         # Initialize the output folder
         self.output_folder = output_folder
@@ -46,44 +50,75 @@ class Recorder:
         if reset_config:
             self.config = deepcopy(self.input_config)
         # Initialize next recording output
-        if not name:
-            name = datetime.now().strftime('date_%Y-%m-%d;time_%H-%M-%S')
-        self.next_output = self.output_folder / name
-        self.next_output.mkdir(exist_ok=False)
-        # Initialize all devices
+        if name:
+            self.next_output = self.output_folder / name
+            self.next_output.mkdir(exist_ok=False)
+        else:
+            self.next_output = self._mkdir_unique(
+                datetime.now().strftime('date_%Y-%m-%d;time_%H-%M-%S')
+                )
+        # Release the previous devices before initializing new ones, as they
+        # might still hold the hardware (e.g. warm started cameras)
+        self.devices = []
         self.devices = self.config.devices(self.next_output)
 
+    def _mkdir_unique(self, name: str) -> Path:
+        # Creates a new subfolder of the output folder, appending a suffix to
+        # the name if it already exists (e.g. several setups within a second)
+        folder, suffix = self.output_folder / name, 0
+        while True:
+            try:
+                folder.mkdir()
+                return folder
+            except FileExistsError:
+                suffix += 1
+                folder = self.output_folder / f'{name}_{suffix}'
+
     def start(self):
         # Start the recording. Does nothing if the recording is not setup.
-        for d in self.devices:
-            try:
-                d.start()
-            except Exception as e:
-                raise RuntimeError(
-                    f'Failed to start recording with device {d}: {e}'
-                    )
+        self._wait_event.clear()
+        # Devices that are `thread_safe` are started concurrently, while the
+        # rest are started one after the other from this thread
+        workers = max(1, sum(d.thread_safe for d in self.devices))
+        with ThreadPoolExecutor(workers) as executor:
+            starts = [
+                executor.submit(d.start).result if d.thread_safe else d.start
+                for d in self.devices
+                ]
+            for d, start in zip(self.devices, starts):
+                try:
+                    start()
+                except Exception as e:
+                    raise RuntimeError(
+                        f'Failed to start recording with device {d}: {e}'
+                        )
 
     def stop(self) -> Path:
         # Stop the recording
+        self._wait_event.set()
         for d in self.devices:
             d.stop()
         # Cleanup devices, setup must be called to start recording again
         self.devices = []
         if not self.next_output:
             raise RuntimeError('Recording not setup')
-        output = Path(str(self.next_output))
-        self.next_output = None
+        output, self.next_output = self.next_output, None
         return output
 
-    @staticmethod
-    def wait(seconds: Optional[int] = None):
-        # Wait for user input
+    def wait(self, seconds: Optional[int] = None):
+        # Wait for user input, or for the given seconds unless the recording is
+        # stopped before
         if seconds is None:
             input('Press `Enter` to stop recording.')
-        else:
-            with progressbar(range(seconds * 10), label='Recording...') as p:
-                for _ in p:
-                    sleep(0.1)
+            return
+        deadline = monotonic() + seconds
+        with progressbar(length=seconds, label='Recording...') as p:
+            while (remaining := deadline - monotonic()) > 0:
+                # The progress bar is only redrawn once per second
+                if self._wait_event.wait(min(1, remaining)):
+                    break
+                elapsed = seconds - max(0, deadline - monotonic())
+                p.update(int(elapsed) - p.pos)
 
     def __call__(self, seconds: Optional[int] = None) -> Path:
         self.start()
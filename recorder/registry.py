@@ -0,0 +1,86 @@
+from typing import Callable, Dict
+from importlib import import_module
+from collections.abc import Mapping
+
+
+class LazyRegistry(Mapping):
+    """Mapping from names to classes that are imported on first access.
+
+    Classes are registered as `package.module:ClassName` strings, so that
+    modules with heavy dependencies (e.g. device drivers) are only imported
+    when the class is actually needed.
+
+    Raises:
+        KeyError: When accessing a name that is not registered.
+        ImportError: When the module of a registered class can not be
+            imported, typically because an optional dependency is missing.
+    """
+
+    def __init__(self, paths: Dict[str, str], kind: str = 'class') -> None:
+        self.paths = paths
+        # Kind of the registered classes, used in error messages
+        self.kind = kind
+        self._classes = {}
+
+    def __getitem__(self, name: str) -> type:
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+        module_name, _, class_name = self.paths[name].partition(':')
+        try:
+            module = import_module(module_name)
+        except (ImportError, OSError) as e:
+            # Native libraries missing in the system raise OSError
+            raise ImportError(f"`{name}` is not available: {e}") from e
+        cls = self._classes[name] = getattr(module, class_name)
+        return cls
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def class_names(self) -> Dict[str, str]:
+        # Registered names indexed by class name
+        return {
+            path.rpartition(':')[2]: name
+            for name, path in self.paths.items()
+            }
+
+    def lookup(self, name: str) -> type:
+        """Imports the class registered with the given name.
+
+        Args:
+            name (str): Case independent name of the class.
+
+        Raises:
+            RuntimeError: If the name is not registered or the dependencies of
+                the class are not available.
+
+        Returns:
+            type: The registered class.
+        """
+        try:
+            return self[name.lower()]
+        except KeyError:
+            raise RuntimeError(
+                f"Invalid {self.kind} `{name}`. Available options: "
+                f"{list(self.keys())}"
+                ) from None
+        except ImportError as e:
+            raise RuntimeError(str(e)) from e
+
+    def module_getattr(self, module: str) -> Callable[[str], type]:
+        # Module level `__getattr__` that imports the registered classes by
+        # their class name, e.g. `from recorder.device import Microphone`
+        def __getattr__(name: str) -> type:
+            try:
+                return self[self.class_names()[name]]
+            except KeyError:
+                raise AttributeError(
+                    f"module {module!r} has no attribute {name!r}"
+                    ) from None
+
+        return __getattr__
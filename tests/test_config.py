@@ -1,7 +1,19 @@
 from recorder.config import Config
 
+from copy import deepcopy
+
 
 def test_init(example_config_path):
     config = Config.from_yaml(example_config_path)
     if not config:
         raise AssertionError
+
+
+def test_deepcopy(example_config_path):
+    config = Config.from_yaml(example_config_path)
+    copy = deepcopy(config)
+    if not isinstance(copy, Config) or copy != config:
+        raise AssertionError
+    copy['microphone'][0]['start_timestamp'] = 0
+    if 'start_timestamp' in config['microphone'][0]:
+        raise AssertionError
@@ -0,0 +1,146 @@
+from recorder.io import FrameWriter, wave_header, wave_read, wave_write
+
+import os
+import wave
+import struct
+import pytest
+import numpy as np
+
+from types import SimpleNamespace
+
+
+def test_wave_header(tmp_path):
+    samples = np.arange(-300, 300, dtype='int16').reshape(-1, 2)
+    path = tmp_path / 'test.wav'
+    with open(path, 'wb') as f:
+        f.write(wave_header(2, 16000, 2, data_size=samples.nbytes))
+        f.write(samples.tobytes())
+    data, samplerate = wave_read(path)
+    if samplerate != 16000:
+        raise AssertionError
+    if not np.array_equal(data, samples):
+        raise AssertionError
+
+
+def test_wave_read_unfinished(tmp_path):
+    # Recordings interrupted before the header is completed
+    samples = np.arange(100, dtype='int16').reshape(-1, 1)
+    path = tmp_path / 'test.wav'
+    with open(path, 'wb') as f:
+        f.write(wave_header(1, 16000, 2))
+        f.write(samples.tobytes())
+    data, _ = wave_read(path)
+    if not np.array_equal(data, samples):
+        raise AssertionError
+
+
+def test_wave_read_empty(tmp_path):
+    path = tmp_path / 'test.wav'
+    with open(path, 'wb') as f:
+        f.write(wave_header(2, 16000, 2))
+    data, _ = wave_read(path)
+    if data.shape != (0, 2):
+        raise AssertionError
+
+
+def test_wave_read_unsupported(tmp_path):
+    # 32 bit float samples have the same size as PCM ones
+    header = bytearray(wave_header(1, 16000, 4, data_size=8))
+    header[20:22] = struct.pack('<H', 3)  # IEEE float format tag
+    path = tmp_path / 'test.wav'
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(np.array([0.5, -0.25], dtype='<f4').tobytes())
+    try:
+        wave_read(path)
+    except ValueError:
+        return
+    raise AssertionError
+
+
+def test_wave_write(tmp_path):
+    samples = np.arange(-300, 300, dtype='>i2').reshape(-1, 3)
+    path = tmp_path / 'test.wav'
+    wave_write(path, samples, 8000)
+    data, samplerate = wave_read(path)
+    if samplerate != 8000:
+        raise AssertionError
+    if not np.array_equal(data, samples):
+        raise AssertionError
+
+
+@pytest.mark.parametrize('vectored', [True, False])
+def test_frame_writer(tmp_path, monkeypatch, vectored):
+    # Write at most 3 bytes per call to exercise resuming partial writes, both
+    # with `os.writev` and with the `os.write` fallback of other platforms
+    write = os.write
+    monkeypatch.setattr(os, 'write', lambda fd, data: write(fd, data[:3]))
+    monkeypatch.delattr(os, 'writev', raising=False)
+    if vectored:
+        monkeypatch.setattr(
+            os,
+            'writev',
+            lambda fd, buffers: write(fd, buffers[0][:3]),
+            raising=False,
+            )
+    path = tmp_path / 'test.wav'
+    writer = FrameWriter(path, 1, 8, 2)  # Ring buffer of 32 bytes
+    writer.interval = 60  # Only drained by the test and when closed
+    writer.start()
+    time = SimpleNamespace(inputBufferAdcTime=1.5)
+    samples = np.arange(50, dtype='<i2')
+    # Blocks of 20 bytes wrap around the end of the ring buffer
+    for i in range(0, 30, 10):
+        writer.callback(samples[i:i + 10].tobytes(), 10, time, None)
+        writer._drain(force=True)
+    writer.callback(samples[30:40].tobytes(), 10, time, None)
+    # Does not fit in the 12 bytes left, so it is dropped
+    writer.callback(samples[40:50].tobytes(), 10, time, None)
+    writer.close()
+    if writer.dropped != 20 or writer.first_adc_time != 1.5:
+        raise AssertionError
+    with wave.open(str(path)) as f:
+        if f.getnframes() != 40 or f.getframerate() != 8:
+            raise AssertionError
+    data, _ = wave_read(path)
+    if not np.array_equal(data[:, 0], samples[:40]):
+        raise AssertionError
+
+
+def test_frame_writer_not_started(tmp_path):
+    path = tmp_path / 'test.wav'
+    FrameWriter(path, 2, 8, 2).close()
+    if path.exists():
+        raise AssertionError
+
+
+def test_frame_writer_error(tmp_path):
+    path = tmp_path / 'test.wav'
+    writer = FrameWriter(path, 1, 8, 2)
+
+    def drain(force=False):
+        raise OSError(28, 'No space left on device')
+
+    writer._drain = drain
+    writer.start()
+    writer.close()
+    if not isinstance(writer.error, OSError) or writer.fd is not None:
+        raise AssertionError
+    # Only the header was written before the error
+    with wave.open(str(path)) as f:
+        if f.getnframes() != 0:
+            raise AssertionError
+
+
+def test_wave_write_invalid(tmp_path):
+    path = tmp_path / 'test.wav'
+    for samples in (
+        np.zeros((10, 2), dtype='float32'),
+        np.zeros((10, 2), dtype='int8'),
+        np.zeros(10, dtype='int16'),
+        ):
+        try:
+            wave_write(path, samples, 8000)
+        except ValueError:
+            continue
+        raise AssertionError
@@ -0,0 +1,44 @@
+from recorder.listener.localhost import Localhost
+from recorder import Recorder, Config
+
+import pytest
+
+
+@pytest.fixture
+def client(tmp_path):
+    recorder = Recorder(Config({}), tmp_path, setup_name=False)
+    return Localhost(recorder).app.test_client()
+
+
+def test_setup_reuse(client):
+    name = client.get('/setup').get_data(as_text=True)
+    # A pending setup is reused unless another name is requested
+    if client.get('/setup').get_data(as_text=True) != name:
+        raise AssertionError
+    if client.get(f'/setup?name={name}').get_data(as_text=True) != name:
+        raise AssertionError
+    if client.get('/setup?name=other').get_data(as_text=True) != 'other':
+        raise AssertionError
+
+
+def test_start_not_setup(client):
+    if client.get('/start').status_code != 409:
+        raise AssertionError
+    # The rejected start does not block later setups
+    if client.get('/setup?name=a').status_code != 200:
+        raise AssertionError
+
+
+def test_setup_while_recording(client):
+    client.get('/setup?name=a')
+    if client.get('/start').status_code != 200:
+        raise AssertionError
+    if client.get('/start').status_code != 409:
+        raise AssertionError
+    if client.get('/setup?name=b').status_code != 409:
+        raise AssertionError
+    response = client.get('/stop')
+    if response.status_code != 200 or response.get_data(as_text=True) != 'a':
+        raise AssertionError
+    if client.get('/setup?name=b').get_data(as_text=True) != 'b':
+        raise AssertionError
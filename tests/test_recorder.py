@@ -0,0 +1,32 @@
+from recorder import Recorder, Config
+
+from datetime import datetime
+
+
+def test_setup_unique_names(tmp_path, monkeypatch):
+    # Every setup happens within the same second
+    now = datetime(2022, 4, 1, 12, 30, 15)
+    monkeypatch.setattr(
+        'recorder.recorder.datetime',
+        type('datetime', (), {'now': staticmethod(lambda: now)}),
+        )
+    recorder = Recorder(Config({}), tmp_path)
+    names = [recorder.next_output.name]
+    for _ in range(2):
+        recorder.setup()
+        names.append(recorder.next_output.name)
+    name = 'date_2022-04-01;time_12-30-15'
+    if names != [name, f'{name}_1', f'{name}_2']:
+        raise AssertionError
+    if not all((tmp_path / n).is_dir() for n in names):
+        raise AssertionError
+
+
+def test_setup_named(tmp_path):
+    recorder = Recorder(Config({}), tmp_path, setup_name='test')
+    # Explicit names are never disambiguated
+    try:
+        recorder.setup('test')
+    except FileExistsError:
+        return
+    raise AssertionError
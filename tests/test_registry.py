@@ -0,0 +1,53 @@
+from recorder.registry import LazyRegistry
+from recorder.device import DEVICE_CLASSES, get_device_class
+
+import recorder.device
+
+REGISTRY = LazyRegistry({
+    'registry': 'recorder.registry:LazyRegistry',
+    'missing': 'recorder.missing:Missing',
+    }, 'test class')
+
+
+def test_missing_module():
+    try:
+        REGISTRY['missing']
+    except ImportError as e:
+        if '`missing` is not available' not in str(e):
+            raise AssertionError
+    else:
+        raise AssertionError
+    try:
+        REGISTRY.lookup('missing')
+    except RuntimeError as e:
+        if not isinstance(e.__cause__, ImportError):
+            raise AssertionError
+    else:
+        raise AssertionError
+
+
+def test_unknown_name():
+    try:
+        get_device_class('unknown')
+    except RuntimeError as e:
+        if str(list(DEVICE_CLASSES.keys())) not in str(e):
+            raise AssertionError
+    else:
+        raise AssertionError
+
+
+def test_case_insensitive():
+    if REGISTRY.lookup('Registry') is not LazyRegistry:
+        raise AssertionError
+
+
+def test_module_getattr():
+    if REGISTRY.module_getattr('test')('LazyRegistry') is not LazyRegistry:
+        raise AssertionError
+    try:
+        recorder.device.Unknown
+    except AttributeError as e:
+        if "'recorder.device' has no attribute 'Unknown'" not in str(e):
+            raise AssertionError
+    else:
+        raise AssertionError